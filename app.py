@@ -1,9 +1,30 @@
 import streamlit as st
-import json
-import datetime
+import string
+from collections import ChainMap, deque
 from chatbot import TalentScoutChatbot
 from database_handler import DatabaseHandler
 
+# Conversation ending keywords, matched against whole words of the input
+_ENDING_KEYWORDS = frozenset({"exit", "quit", "bye", "goodbye", "end", "stop"})
+
+def _is_ending_message(user_input: str) -> bool:
+    """Return True if any word of the input is a conversation ending keyword."""
+    tokens = user_input.lower().split()
+    return not _ENDING_KEYWORDS.isdisjoint(token.strip(string.punctuation) for token in tokens)
+
+# Chat avatars by message role
+_AVATARS = {"assistant": "🤖", "user": "👤"}
+
+@st.cache_resource
+def get_data_handler() -> DatabaseHandler:
+    """
+    Return the process-wide DatabaseHandler shared by all sessions.
+    
+    Streamlit runs each session's script on its own thread, so this relies on the
+    handler keeping per-thread database sessions rather than one shared Session.
+    """
+    return DatabaseHandler()
+
 def main():
     """Main Streamlit application for TalentScout Hiring Assistant"""
     
@@ -18,72 +39,77 @@ def main():
     # Initialize session state
     if 'chatbot' not in st.session_state:
         st.session_state.chatbot = TalentScoutChatbot()
-        st.session_state.data_handler = DatabaseHandler()
+        st.session_state.data_handler = get_data_handler()
         st.session_state.conversation_started = False
         st.session_state.conversation_ended = False
-        st.session_state.messages = []
+        st.session_state.messages = deque()
+    
+    # Bind session objects once per rerun instead of going through the proxy each time
+    chatbot = st.session_state.chatbot
+    data_handler = st.session_state.data_handler
+    messages = st.session_state.messages
     
     # Header
     st.title("🎯 TalentScout Hiring Assistant")
     st.markdown("---")
     
-    # Auto-start conversation with minimal greeting
+    # Auto-start conversation with minimal greeting; it renders with the history below
     if not st.session_state.conversation_started:
         st.session_state.conversation_started = True
-        initial_message = st.session_state.chatbot.start_conversation()
-        st.session_state.messages.append({"role": "assistant", "content": initial_message})
-        st.rerun()
+        initial_message = chatbot.start_conversation()
+        messages.append({"role": "assistant", "content": initial_message})
     
     # Main chat interface
     if st.session_state.conversation_started and not st.session_state.conversation_ended:
-        # Display chat history
+        # Reserve the history area now and fill it after handling input, so messages
+        # appended during this run render without another st.rerun()
         chat_container = st.container()
-        with chat_container:
-            for message in st.session_state.messages:
-                if message["role"] == "assistant":
-                    with st.chat_message("assistant", avatar="🤖"):
-                        st.markdown(message["content"])
-                else:
-                    with st.chat_message("user", avatar="👤"):
-                        st.markdown(message["content"])
         
         # Chat input
         user_input = st.chat_input("Type your response here...")
         
         if user_input:
             # Add user message to chat
-            st.session_state.messages.append({"role": "user", "content": user_input})
+            messages.append({"role": "user", "content": user_input})
             
             # Check for conversation ending keywords
-            ending_keywords = ['exit', 'quit', 'bye', 'goodbye', 'end', 'stop']
-            if any(keyword in user_input.lower() for keyword in ending_keywords):
-                farewell_message = st.session_state.chatbot.end_conversation()
-                st.session_state.messages.append({"role": "assistant", "content": farewell_message})
+            if _is_ending_message(user_input):
+                farewell_message = chatbot.end_conversation()
+                messages.append({"role": "assistant", "content": farewell_message})
                 st.session_state.conversation_ended = True
                 
                 # Save candidate data with technical questions
-                if st.session_state.chatbot.candidate_data:
-                    candidate_data = st.session_state.chatbot.candidate_data.copy()
-                    candidate_data['technical_questions'] = st.session_state.chatbot.technical_questions
-                    st.session_state.data_handler.save_candidate_data(candidate_data)
+                if chatbot.candidate_data:
+                    candidate_data = ChainMap(
+                        {'technical_questions': chatbot.technical_questions},
+                        chatbot.candidate_data
+                    )
+                    data_handler.save_candidate_data(candidate_data)
                 
+                # Switch to the summary view, which replaces the chat interface
                 st.rerun()
             else:
                 # Process user input and get response
-                response = st.session_state.chatbot.process_input(user_input)
-                st.session_state.messages.append({"role": "assistant", "content": response})
-                st.rerun()
+                response = chatbot.process_input(user_input)
+                messages.append({"role": "assistant", "content": response})
+        
+        # Display chat history
+        with chat_container:
+            for message in messages:
+                role = message["role"]
+                with st.chat_message(role, avatar=_AVATARS[role]):
+                    st.markdown(message["content"])
     
     # Conversation ended state
     if st.session_state.conversation_ended:
         st.success("Thank you for completing the initial screening!")
         
-        if st.session_state.chatbot.candidate_data:
+        if chatbot.candidate_data:
             st.markdown("### Interview Summary")
             
             # Display collected information
             with st.expander("📋 Collected Information", expanded=True):
-                data = st.session_state.chatbot.candidate_data
+                data = chatbot.candidate_data
                 col1, col2 = st.columns(2)
                 
                 with col1:
@@ -105,9 +131,9 @@ def main():
                         st.write(f"**Tech Stack:** {', '.join(data['tech_stack'])}")
             
             # Display technical questions asked
-            if st.session_state.chatbot.technical_questions:
+            if chatbot.technical_questions:
                 with st.expander("🔧 Technical Questions Asked", expanded=False):
-                    for i, question in enumerate(st.session_state.chatbot.technical_questions, 1):
+                    for i, question in enumerate(chatbot.technical_questions, 1):
                         st.write(f"{i}. {question}")
         
         # Reset option
@@ -135,7 +161,7 @@ def main():
         
         if st.session_state.conversation_started:
             st.markdown("### 📊 Progress")
-            progress = st.session_state.chatbot.get_progress()
+            progress = chatbot.get_progress()
             st.progress(progress / 100)
             st.write(f"{progress}% Complete")
 
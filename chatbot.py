@@ -1,7 +1,41 @@
 import re
 import json
-from typing import Dict, List, Optional, Any
-from ai_question_generator import AIQuestionGenerator
+import string
+from typing import Callable, Dict, List, Optional, Any
+from ai_question_generator import get_generator
+
+# Input validation patterns, compiled once at import
+_EMAIL_RE = re.compile(r"^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$")
+_YEARS_RE = re.compile(r'\d+')
+
+# Characters allowed in names; a plain character-class test, done as a set lookup
+_NAME_CHARS = frozenset(string.ascii_letters + string.whitespace)
+
+# Separators allowed in phone numbers, deleted in one pass before checking the digits
+_PHONE_STRIP = str.maketrans('', '', string.whitespace + "-().")
+
+def _is_valid_name(value: str) -> bool:
+    """Check for 2-50 characters consisting of letters and whitespace."""
+    return 2 <= len(value) <= 50 and _NAME_CHARS.issuperset(value)
+
+def _is_valid_phone(value: str) -> bool:
+    """Check for an optional leading '+' and at least 8 digits, within 20 characters of digits and separators."""
+    number = value.removeprefix("+")
+    digits = number.translate(_PHONE_STRIP)
+    return len(number) <= 20 and len(digits) >= 8 and digits.isascii() and digits.isdigit()
+
+# Technology names and spellings mapped to their _FALLBACK_DB key
+_FALLBACK_ALIASES = {
+    alias: key
+    for key, aliases in {
+        "python": ("python", "python3", "py"),
+        "javascript": ("javascript", "js", "ecmascript"),
+        "react": ("react", "reactjs", "react.js"),
+        "java": ("java",),
+        "sql": ("sql", "mysql", "postgresql", "postgres", "sqlite", "t-sql")
+    }.items()
+    for alias in aliases
+}
 
 class TalentScoutChatbot:
     """
@@ -9,12 +43,42 @@ class TalentScoutChatbot:
     Handles conversation flow, information gathering, and technical questioning.
     """
     
+    # Fallback questions if API generation fails
+    _FALLBACK_DB = {
+        "python": (
+            "What are the differences between lists and tuples in Python?",
+            "Explain the concept of decorators in Python with an example.",
+            "How does Python's garbage collection work?"
+        ),
+        "javascript": (
+            "Explain the difference between var, let, and const in JavaScript.",
+            "What is event bubbling and how can you prevent it?",
+            "How do closures work in JavaScript?"
+        ),
+        "react": (
+            "What is the difference between state and props in React?",
+            "Explain the React component lifecycle methods.",
+            "What are React hooks and why are they useful?"
+        ),
+        "java": (
+            "What is the difference between abstract classes and interfaces in Java?",
+            "Explain the concept of polymorphism in Java.",
+            "How does garbage collection work in Java?"
+        ),
+        "sql": (
+            "What is the difference between INNER JOIN and LEFT JOIN?",
+            "Explain what database normalization is and why it's important.",
+            "How would you optimize a slow-running SQL query?"
+        )
+    }
+    
     def __init__(self):
-        self.question_generator = AIQuestionGenerator()
+        self.question_generator = get_generator()
         self.conversation_state = "greeting"
         self.candidate_data = {}
         self.technical_questions = []
         self.current_tech_index = 0
+        self.current_tech_questions = 0  # Questions asked so far for the current technology
         self.questions_per_tech = 3
         
         # Define conversation flow states
@@ -22,12 +86,25 @@ class TalentScoutChatbot:
             "greeting", "name", "email", "phone", "experience", 
             "position", "location", "tech_stack", "technical_questions", "completed"
         ]
+        self._state_index = {state: index for index, state in enumerate(self.states)}
+        
+        # Input handlers by conversation state; other states use the fallback handler
+        self._handlers: Dict[str, Callable[[str], str]] = {
+            "name": self._handle_name,
+            "email": self._handle_email,
+            "phone": self._handle_phone,
+            "experience": self._handle_experience,
+            "position": self._handle_position,
+            "location": self._handle_location,
+            "tech_stack": self._handle_tech_stack,
+            "technical_questions": self._handle_technical_questions
+        }
         
         # Required fields for validation
         self.required_fields = {
-            "name": r"^[a-zA-Z\s]{2,50}$",
-            "email": r"^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$",
-            "phone": r"^[\+]?[\d\s\-\(\)\.]{8,20}$"
+            "name": _is_valid_name,
+            "email": _EMAIL_RE.match,
+            "phone": _is_valid_phone
         }
     
     def start_conversation(self) -> str:
@@ -43,28 +120,12 @@ class TalentScoutChatbot:
             return "I didn't receive any input. Could you please try again?"
         
         # Handle different conversation states
-        if self.conversation_state == "name":
-            return self._handle_name(user_input)
-        elif self.conversation_state == "email":
-            return self._handle_email(user_input)
-        elif self.conversation_state == "phone":
-            return self._handle_phone(user_input)
-        elif self.conversation_state == "experience":
-            return self._handle_experience(user_input)
-        elif self.conversation_state == "position":
-            return self._handle_position(user_input)
-        elif self.conversation_state == "location":
-            return self._handle_location(user_input)
-        elif self.conversation_state == "tech_stack":
-            return self._handle_tech_stack(user_input)
-        elif self.conversation_state == "technical_questions":
-            return self._handle_technical_questions(user_input)
-        else:
-            return self._handle_fallback(user_input)
+        handler = self._handlers.get(self.conversation_state, self._handle_fallback)
+        return handler(user_input)
     
     def _handle_name(self, user_input: str) -> str:
         """Handle name collection."""
-        if re.match(self.required_fields["name"], user_input):
+        if self.required_fields["name"](user_input):
             self.candidate_data["name"] = user_input
             self.conversation_state = "email"
             return f"Nice to meet you, {user_input}! 👋\n\n**What's your email address?**"
@@ -76,7 +137,7 @@ class TalentScoutChatbot:
     
     def _handle_email(self, user_input: str) -> str:
         """Handle email collection."""
-        if re.match(self.required_fields["email"], user_input):
+        if self.required_fields["email"](user_input):
             self.candidate_data["email"] = user_input
             self.conversation_state = "phone"
             return "Great! **What's your phone number?**"
@@ -88,7 +149,7 @@ class TalentScoutChatbot:
     
     def _handle_phone(self, user_input: str) -> str:
         """Handle phone number collection."""
-        if re.match(self.required_fields["phone"], user_input):
+        if self.required_fields["phone"](user_input):
             self.candidate_data["phone"] = user_input
             self.conversation_state = "experience"
             return "Perfect! **How many years of professional experience do you have?**"
@@ -101,7 +162,7 @@ class TalentScoutChatbot:
     def _handle_experience(self, user_input: str) -> str:
         """Handle experience collection."""
         # Extract years from input
-        years_match = re.search(r'\d+', user_input)
+        years_match = _YEARS_RE.search(user_input)
         if years_match:
             years = int(years_match.group())
             if 0 <= years <= 50:
@@ -147,13 +208,21 @@ class TalentScoutChatbot:
     
     def _handle_tech_stack(self, user_input: str) -> str:
         """Handle tech stack collection and initiate technical questions."""
-        # Parse tech stack from user input
-        tech_stack = [tech.strip() for tech in user_input.split(',') if tech.strip()]
+        # Parse tech stack from user input, stripping each entry once and dropping
+        # case-insensitive repeats (keeping the first spelling) so no technology is
+        # assessed twice; question lookup ignores case too
+        techs = (tech.strip() for tech in user_input.split(','))
+        unique_techs: Dict[str, str] = {}
+        for tech in techs:
+            if tech:
+                unique_techs.setdefault(tech.casefold(), tech)
+        tech_stack = list(unique_techs.values())
         
         if len(tech_stack) >= 1:
             self.candidate_data["tech_stack"] = tech_stack
             self.conversation_state = "technical_questions"
             self.current_tech_index = 0
+            self.current_tech_questions = 0
             
             # Generate first set of technical questions
             return self._generate_next_technical_questions()
@@ -166,13 +235,12 @@ class TalentScoutChatbot:
     
     def _handle_technical_questions(self, user_input: str) -> str:
         """Handle technical question responses and progression."""
-        # Store the answer (in a real implementation, you might want to evaluate answers)
-        current_tech = self.candidate_data["tech_stack"][self.current_tech_index]
-        
+        # Answers are not stored yet (in a real implementation, you might want to evaluate answers)
         # Move to next question or next technology
-        if len(self.technical_questions) % self.questions_per_tech == 0:
+        if self.current_tech_questions >= self.questions_per_tech:
             # Move to next technology
             self.current_tech_index += 1
+            self.current_tech_questions = 0
             
             if self.current_tech_index >= len(self.candidate_data["tech_stack"]):
                 # All technologies covered
@@ -190,9 +258,7 @@ class TalentScoutChatbot:
         current_tech = self.candidate_data["tech_stack"][self.current_tech_index]
         
         # Check if this is the first question for this technology
-        questions_for_current_tech = len(self.technical_questions) % self.questions_per_tech
-        
-        if questions_for_current_tech == 0:
+        if self.current_tech_questions == 0:
             # First question for this technology
             intro_message = f"\n🔧 **Technical Assessment: {current_tech}**\n\n"
             intro_message += f"I'll ask you {self.questions_per_tech} questions about {current_tech}. "
@@ -200,19 +266,18 @@ class TalentScoutChatbot:
         else:
             intro_message = ""
         
-        # Generate a question using the AI question generator (no fallback)
-        question = self.question_generator.generate_question(
-            current_tech, 
-            questions_for_current_tech + 1
-        )
+        # Generate a question using the shared, memoized question generator (no fallback)
+        question_num = self.current_tech_questions + 1
+        question = self.question_generator.generate_question(current_tech, question_num)
         
         if question:
             self.technical_questions.append(question)
-            question_num = questions_for_current_tech + 1
+            self.current_tech_questions = question_num
             return f"{intro_message}**Question {question_num} ({current_tech}):** {question}"
         else:
             # Skip to next technology if AI generation fails
             self.current_tech_index += 1
+            self.current_tech_questions = 0
             if self.current_tech_index >= len(self.candidate_data["tech_stack"]):
                 self.conversation_state = "completed"
                 return self._complete_technical_assessment()
@@ -223,57 +288,36 @@ class TalentScoutChatbot:
         """Complete the technical assessment and provide summary."""
         self.conversation_state = "completed"
         
-        summary = "\n🎉 **Technical Assessment Complete!**\n\n"
-        summary += f"Thank you for answering the technical questions! I've assessed your knowledge across "
-        summary += f"{len(self.candidate_data['tech_stack'])} technologies: "
-        summary += f"{', '.join(self.candidate_data['tech_stack'])}.\n\n"
-        
-        summary += "**Next Steps:**\n"
-        summary += "• Our technical team will review your responses\n"
-        summary += "• You'll receive an email within 2-3 business days with feedback\n"
-        summary += "• If you advance, we'll schedule a technical interview\n"
-        summary += "• For any questions, contact us at hr@talentscout.com\n\n"
-        
-        summary += "Is there anything else you'd like to know about the position or our company? "
-        summary += "Otherwise, you can type 'exit' to end our conversation."
+        tech_stack = self.candidate_data['tech_stack']
         
-        return summary
+        # Build the message in one expression instead of repeated concatenation
+        return (
+            "\n🎉 **Technical Assessment Complete!**\n\n"
+            "Thank you for answering the technical questions! I've assessed your knowledge across "
+            f"{len(tech_stack)} technologies: {', '.join(tech_stack)}.\n\n"
+            "**Next Steps:**\n"
+            "• Our technical team will review your responses\n"
+            "• You'll receive an email within 2-3 business days with feedback\n"
+            "• If you advance, we'll schedule a technical interview\n"
+            "• For any questions, contact us at hr@talentscout.com\n\n"
+            "Is there anything else you'd like to know about the position or our company? "
+            "Otherwise, you can type 'exit' to end our conversation."
+        )
     
     def _get_fallback_questions(self, technology: str) -> List[str]:
         """Provide fallback questions if API generation fails."""
-        fallback_db = {
-            "python": [
-                "What are the differences between lists and tuples in Python?",
-                "Explain the concept of decorators in Python with an example.",
-                "How does Python's garbage collection work?"
-            ],
-            "javascript": [
-                "Explain the difference between var, let, and const in JavaScript.",
-                "What is event bubbling and how can you prevent it?",
-                "How do closures work in JavaScript?"
-            ],
-            "react": [
-                "What is the difference between state and props in React?",
-                "Explain the React component lifecycle methods.",
-                "What are React hooks and why are they useful?"
-            ],
-            "java": [
-                "What is the difference between abstract classes and interfaces in Java?",
-                "Explain the concept of polymorphism in Java.",
-                "How does garbage collection work in Java?"
-            ],
-            "sql": [
-                "What is the difference between INNER JOIN and LEFT JOIN?",
-                "Explain what database normalization is and why it's important.",
-                "How would you optimize a slow-running SQL query?"
-            ]
-        }
-        
-        # Try to find questions for the exact technology or a close match
-        tech_lower = technology.lower()
-        for key in fallback_db:
-            if key in tech_lower or tech_lower in key:
-                return fallback_db[key]
+        # Try the exact technology or a known alias, then a partial match either way
+        # ("React Native", "PostgreSQL 14", "jav") in the bank's key order
+        tech_lower = technology.strip().lower()
+        key = _FALLBACK_ALIASES.get(tech_lower)
+        if key is None:
+            key = next(
+                (tech_key for tech_key in self._FALLBACK_DB
+                 if tech_key in tech_lower or tech_lower in tech_key),
+                None
+            )
+        if key is not None:
+            return list(self._FALLBACK_DB[key])
         
         # Generic programming questions if no specific match
         return [
@@ -299,12 +343,11 @@ class TalentScoutChatbot:
         """End the conversation gracefully."""
         self.conversation_state = "ended"
         
-        message = "\n👋 **Thank you for your time!**\n\n"
+        recorded = "I've recorded all the information you provided. " if self.candidate_data else ""
         
-        if self.candidate_data:
-            message += "I've recorded all the information you provided. "
-            
-        message += (
+        return (
+            "\n👋 **Thank you for your time!**\n\n"
+            f"{recorded}"
             "Our team will review your details and get back to you soon.\n\n"
             "**Next Steps:**\n"
             "• Check your email for confirmation and next steps\n"
@@ -316,12 +359,10 @@ class TalentScoutChatbot:
             "🌐 www.talentscout.com\n\n"
             "Good luck with your application! 🍀"
         )
-        
-        return message
     
     def get_progress(self) -> int:
         """Calculate conversation progress percentage."""
-        if self.conversation_state in self.states:
-            current_index = self.states.index(self.conversation_state)
+        current_index = self._state_index.get(self.conversation_state)
+        if current_index is not None:
             return int((current_index / len(self.states)) * 100)
         return 0
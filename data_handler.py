@@ -1,8 +1,26 @@
 import json
 import os
 import datetime
-from typing import Dict, List, Any, Optional
+import hashlib
+import threading
+import time
+from typing import Callable, Dict, Iterator, List, Any, Optional, Tuple
 import re
+import string
+
+try:
+    import orjson
+except ImportError:  # Optional accelerator; fall back to the stdlib json module
+    orjson = None
+
+# Validation patterns, compiled once at import
+_EMAIL_RE = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+
+# Keeps Windows from translating newlines in the record log; 0 elsewhere
+_O_BINARY = getattr(os, 'O_BINARY', 0)
+
+# Separators allowed in stored phone numbers, deleted in one pass before checking the digits
+_PHONE_STRIP = str.maketrans('', '', string.whitespace + '-()')
 
 class DataHandler:
     """
@@ -14,15 +32,67 @@ class DataHandler:
         self.data_directory = "candidate_data"
         self.ensure_data_directory()
         
+        # All saves are appended as one JSON line each to a single record log
+        self.log_path = os.path.join(self.data_directory, "records.jsonl")
+        
         # Privacy settings
         self.data_retention_days = 90  # GDPR compliance
+        self._retention_delta = datetime.timedelta(days=self.data_retention_days)
         self.anonymization_enabled = True
         
+        # Retention cleanup runs in the background at most this often (seconds)
+        self.cleanup_interval = 3600
+        self._last_cleanup: Optional[float] = None
+        
+        # Candidate ID -> byte offsets of its records in the log, oldest first; the lock
+        # guards both the index and the log file against the background cleanup thread
+        self._id_index: Dict[str, List[int]] = {}
+        self._index_lock = threading.Lock()
+        self._migrate_legacy_files()
+        self._rebuild_index()
+        
     def ensure_data_directory(self) -> None:
         """Ensure the data directory exists."""
         if not os.path.exists(self.data_directory):
             os.makedirs(self.data_directory)
     
+    def _rebuild_index(self) -> None:
+        """Rebuild the candidate ID index with a single sequential pass over the record log."""
+        
+        with self._index_lock:
+            index: Dict[str, List[int]] = {}
+            for offset, record in self._iter_records():
+                index.setdefault(record['id'], []).append(offset)
+            self._id_index = index
+    
+    def _migrate_legacy_files(self) -> None:
+        """Fold per-candidate JSON files from the previous storage layout into the record log."""
+        
+        with os.scandir(self.data_directory) as entries:
+            legacy = [
+                (entry.stat().st_mtime, entry.path, candidate_id)
+                for entry in entries
+                if (candidate_id := self._candidate_id_from_filename(entry.name))
+            ]
+        
+        # Oldest first, so the latest save for each candidate stays the last record in the log
+        for mtime, filepath, candidate_id in sorted(legacy):
+            try:
+                with open(filepath, 'rb') as f:
+                    data = self._loads(f.read())
+                self._append_record({'id': candidate_id, 'ts': mtime, **data})
+                os.remove(filepath)
+            except Exception as e:
+                print(f"Error migrating data file {os.path.basename(filepath)}: {str(e)}")
+    
+    @staticmethod
+    def _candidate_id_from_filename(filename: str) -> Optional[str]:
+        """Extract the candidate ID from a legacy 'candidate_<id>_<timestamp>.json' filename."""
+        
+        if filename.startswith('candidate_') and filename.endswith('.json'):
+            return filename[len('candidate_'):].split('_', 1)[0]
+        return None
+    
     def save_candidate_data(self, candidate_data: Dict[str, Any]) -> bool:
         """
         Save candidate data with privacy compliance.
@@ -43,20 +113,14 @@ class DataHandler:
             # Create anonymized copy for storage
             stored_data = self._prepare_data_for_storage(candidate_data)
             
-            # Generate filename with timestamp
-            timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+            # Append one record to the log, keyed by candidate ID and stamped for retention
             candidate_id = self._generate_candidate_id(candidate_data)
-            filename = f"candidate_{candidate_id}_{timestamp}.json"
-            filepath = os.path.join(self.data_directory, filename)
-            
-            # Save to file
-            with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(stored_data, f, indent=2, ensure_ascii=False)
+            self._append_record({'id': candidate_id, 'ts': time.time(), **stored_data})
             
-            print(f"Candidate data saved successfully: {filename}")
+            print(f"Candidate data saved successfully: {candidate_id}")
             
-            # Clean old files if needed
-            self._cleanup_old_data()
+            # Compact out expired records, off the save path and at most once per interval
+            self._schedule_cleanup()
             
             return True
             
@@ -64,6 +128,103 @@ class DataHandler:
             print(f"Error saving candidate data: {str(e)}")
             return False
     
+    @staticmethod
+    def _dumps(data: Dict[str, Any]) -> bytes:
+        """Encode data as compact UTF-8 JSON, using orjson when it is installed."""
+        
+        if orjson is not None:
+            return orjson.dumps(data)
+        return json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    
+    @staticmethod
+    def _loads(payload: bytes) -> Dict[str, Any]:
+        """Decode UTF-8 JSON, using orjson when it is installed."""
+        
+        if orjson is not None:
+            return orjson.loads(payload)
+        return json.loads(payload)
+    
+    def _append_record(self, record: Dict[str, Any]) -> None:
+        """Append a record to the log as one JSON line and index its offset."""
+        
+        line = self._dumps(record) + b'\n'
+        
+        with self._index_lock:
+            # The log is owner-only since it holds candidate PII
+            fd = os.open(self.log_path, os.O_RDWR | os.O_APPEND | os.O_CREAT | _O_BINARY, 0o600)
+            with os.fdopen(fd, 'a+b') as f:
+                offset = f.seek(0, os.SEEK_END)
+                # Terminate a torn trailing write so it can't swallow this record
+                if offset:
+                    f.seek(-1, os.SEEK_END)
+                    if f.read(1) != b'\n':
+                        f.write(b'\n')
+                        offset += 1
+                f.write(line)
+            self._id_index.setdefault(record['id'], []).append(offset)
+    
+    def _read_record(self, offset: int) -> Dict[str, Any]:
+        """Read the single log record starting at the given byte offset."""
+        
+        with open(self.log_path, 'rb') as f:
+            f.seek(offset)
+            return self._loads(f.readline())
+    
+    def _iter_records(self) -> Iterator[Tuple[int, Dict[str, Any]]]:
+        """Yield (offset, record) for every well-formed record line, skipping torn writes."""
+        
+        try:
+            f = open(self.log_path, 'rb')
+        except FileNotFoundError:
+            return
+        
+        with f:
+            offset = 0
+            for line in f:
+                try:
+                    record = self._loads(line) if line.endswith(b'\n') else None
+                except ValueError:
+                    record = None
+                
+                # Skip torn or corrupt lines and anything that isn't a candidate record
+                if isinstance(record, dict) and record.get('id'):
+                    yield offset, record
+                offset += len(line)
+    
+    def _compact_log(self, keep: Callable[[Dict[str, Any]], bool]) -> int:
+        """
+        Rewrite the record log with only the records `keep` accepts.
+        
+        Args:
+            keep: Predicate applied to each decoded record
+            
+        Returns:
+            Number of records dropped
+        """
+        
+        tmp_path = self.log_path + '.tmp'
+        
+        with self._index_lock:
+            records = [record for _, record in self._iter_records()]
+            kept = [record for record in records if keep(record)]
+            
+            # Leave the log untouched when there is nothing to drop
+            if len(kept) == len(records):
+                return 0
+            
+            index: Dict[str, List[int]] = {}
+            fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | _O_BINARY, 0o600)
+            with os.fdopen(fd, 'wb') as f:
+                for record in kept:
+                    index.setdefault(record['id'], []).append(f.tell())
+                    f.write(self._dumps(record) + b'\n')
+            
+            # Swap the compacted log in atomically so readers never see a partial file
+            os.replace(tmp_path, self.log_path)
+            self._id_index = index
+        
+        return len(records) - len(kept)
+    
     def _validate_candidate_data(self, data: Dict[str, Any]) -> bool:
         """Validate candidate data structure and content."""
         
@@ -76,15 +237,13 @@ class DataHandler:
                 return False
         
         # Validate email format
-        email_pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-        if not re.match(email_pattern, data['email']):
+        if not _EMAIL_RE.match(data['email']):
             print("Invalid email format")
             return False
         
         # Validate phone if provided
         if 'phone' in data and data['phone']:
-            phone_pattern = r'^[\+]?[1-9][\d\s\-\(\)]{8,15}$'
-            if not re.match(phone_pattern, data['phone']):
+            if not self._is_valid_phone(data['phone']):
                 print("Invalid phone format")
                 return False
         
@@ -101,14 +260,13 @@ class DataHandler:
             Data prepared for storage with privacy measures applied
         """
         
-        stored_data = candidate_data.copy()
+        stored_data = dict(candidate_data)
         
         # Add metadata
+        now = datetime.datetime.now()
         stored_data['_metadata'] = {
-            'timestamp': datetime.datetime.now().isoformat(),
-            'data_retention_until': (
-                datetime.datetime.now() + datetime.timedelta(days=self.data_retention_days)
-            ).isoformat(),
+            'timestamp': now.isoformat(),
+            'data_retention_until': (now + self._retention_delta).isoformat(),
             'privacy_policy_version': '1.0',
             'gdpr_compliance': True,
             'source': 'TalentScout_Chatbot'
@@ -131,32 +289,47 @@ class DataHandler:
             Data with pseudonymized sensitive fields
         """
         
-        pseudonymized = data.copy()
-        
         # Hash phone number if present (keep format for validation)
-        if 'phone' in pseudonymized and pseudonymized['phone']:
-            phone = pseudonymized['phone']
-            # Keep country code and last 4 digits visible
-            if len(phone) > 6:
-                visible_part = phone[-4:]
-                hidden_part = '*' * (len(phone) - 4)
-                pseudonymized['phone_masked'] = hidden_part + visible_part
-                pseudonymized['phone_hash'] = str(hash(phone))
-                del pseudonymized['phone']  # Remove original
+        phone = data.get('phone')
+        # Keep country code and last 4 digits visible
+        if phone and len(phone) > 6:
+            # Build the copy without the original number instead of copying and deleting it
+            pseudonymized = {key: value for key, value in data.items() if key != 'phone'}
+            pseudonymized['phone_masked'] = '*' * (len(phone) - 4) + phone[-4:]
+            pseudonymized['phone_hash'] = self._stable_hash(phone)
+        else:
+            pseudonymized = data.copy()
         
         # Partial email masking
-        if 'email' in pseudonymized and pseudonymized['email']:
-            email = pseudonymized['email']
+        email = pseudonymized.get('email')
+        if email:
             username, domain = email.split('@')
-            if len(username) > 2:
-                masked_username = username[0] + '*' * (len(username) - 2) + username[-1]
-                pseudonymized['email_masked'] = f"{masked_username}@{domain}"
-                pseudonymized['email_hash'] = str(hash(email))
+            username_length = len(username)
+            if username_length > 2:
+                pseudonymized['email_masked'] = f"{username[0]}{'*' * (username_length - 2)}{username[-1]}@{domain}"
+                pseudonymized['email_hash'] = self._stable_hash(email)
                 # Keep original for business purposes (recruitment contact)
                 # In production, consider additional encryption
         
         return pseudonymized
     
+    @staticmethod
+    def _is_valid_phone(phone: str) -> bool:
+        """Check for an optional '+', a leading 1-9 digit, then 8-15 digits or separators."""
+        number = phone.removeprefix('+')
+        rest = number[1:]
+        digits = rest.translate(_PHONE_STRIP)
+        return (
+            number != '' and number[0] in '123456789'
+            and 8 <= len(rest) <= 15
+            and (not digits or (digits.isascii() and digits.isdigit()))
+        )
+    
+    @staticmethod
+    def _stable_hash(value: str, digest_size: int = 8) -> str:
+        """Return a process-independent BLAKE2b hex digest of the value."""
+        return hashlib.blake2b(value.encode('utf-8'), digest_size=digest_size).hexdigest()
+    
     def _generate_candidate_id(self, candidate_data: Dict[str, Any]) -> str:
         """Generate a unique candidate identifier."""
         
@@ -164,29 +337,32 @@ class DataHandler:
         email = candidate_data.get('email', '')
         name = candidate_data.get('name', '')
         
-        # Simple hash-based ID (in production, use proper UUID)
+        # Stable hash-based ID, so the same candidate maps to the same ID across restarts
         combined = f"{email}{name}".lower().replace(' ', '')
-        candidate_id = str(abs(hash(combined)))[:8]
+        candidate_id = self._stable_hash(combined, digest_size=4)
         
         return candidate_id
     
+    def _schedule_cleanup(self) -> None:
+        """Start a background retention cleanup if none has run within the cleanup interval."""
+        
+        now = time.monotonic()
+        if self._last_cleanup is not None and now - self._last_cleanup < self.cleanup_interval:
+            return
+        
+        self._last_cleanup = now
+        threading.Thread(target=self._cleanup_old_data, daemon=True).start()
+    
     def _cleanup_old_data(self) -> None:
-        """Remove data files older than retention period."""
+        """Compact the record log, dropping records older than the retention period."""
         
         try:
-            current_time = datetime.datetime.now()
-            retention_limit = current_time - datetime.timedelta(days=self.data_retention_days)
+            # Records carry a POSIX save time, so compare against a POSIX cutoff
+            retention_cutoff_ts = time.time() - self._retention_delta.total_seconds()
             
-            for filename in os.listdir(self.data_directory):
-                if filename.endswith('.json'):
-                    filepath = os.path.join(self.data_directory, filename)
-                    
-                    # Check file modification time
-                    file_time = datetime.datetime.fromtimestamp(os.path.getmtime(filepath))
-                    
-                    if file_time < retention_limit:
-                        os.remove(filepath)
-                        print(f"Removed expired data file: {filename}")
+            removed = self._compact_log(lambda record: record.get('ts', 0) >= retention_cutoff_ts)
+            if removed:
+                print(f"Removed {removed} expired candidate record(s)")
                         
         except Exception as e:
             print(f"Error during data cleanup: {str(e)}")
@@ -203,24 +379,24 @@ class DataHandler:
         """
         
         try:
-            for filename in os.listdir(self.data_directory):
-                if filename.startswith(f"candidate_{candidate_id}") and filename.endswith('.json'):
-                    filepath = os.path.join(self.data_directory, filename)
-                    
-                    with open(filepath, 'r', encoding='utf-8') as f:
-                        data = json.load(f)
-                    
-                    # Return summary without sensitive details
-                    summary = {
-                        'candidate_id': candidate_id,
-                        'name': data.get('name', 'N/A'),
-                        'position': data.get('position', 'N/A'),
-                        'experience': data.get('experience', 'N/A'),
-                        'tech_stack': data.get('tech_stack', []),
-                        'timestamp': data.get('_metadata', {}).get('timestamp', 'N/A')
-                    }
-                    
-                    return summary
+            with self._index_lock:
+                offsets = self._id_index.get(candidate_id)
+                # Records are appended in save order, so the last offset is the latest save
+                data = self._read_record(offsets[-1]) if offsets else None
+            
+            if data:
+                
+                # Return summary without sensitive details
+                summary = {
+                    'candidate_id': candidate_id,
+                    'name': data.get('name', 'N/A'),
+                    'position': data.get('position', 'N/A'),
+                    'experience': data.get('experience', 'N/A'),
+                    'tech_stack': data.get('tech_stack', []),
+                    'timestamp': data.get('_metadata', {}).get('timestamp', 'N/A')
+                }
+                
+                return summary
             
             return None
             
@@ -278,16 +454,14 @@ class DataHandler:
         """
         
         try:
-            deleted_files = 0
+            with self._index_lock:
+                if candidate_id not in self._id_index:
+                    return False
             
-            for filename in os.listdir(self.data_directory):
-                if filename.startswith(f"candidate_{candidate_id}") and filename.endswith('.json'):
-                    filepath = os.path.join(self.data_directory, filename)
-                    os.remove(filepath)
-                    deleted_files += 1
-                    print(f"Deleted candidate data file: {filename}")
+            deleted_records = self._compact_log(lambda record: record['id'] != candidate_id)
+            print(f"Deleted {deleted_records} record(s) for candidate: {candidate_id}")
             
-            return deleted_files > 0
+            return deleted_records > 0
             
         except Exception as e:
             print(f"Error deleting candidate data: {str(e)}")
@@ -1,29 +1,70 @@
 import os
 import datetime
+import hashlib
+import re
+import threading
+import time
 from typing import Dict, List, Any, Optional
-from sqlalchemy import create_engine, Column, Integer, String, DateTime, Text, JSON
+from sqlalchemy import create_engine, delete, func, inspect, select, text, update, Column, Integer, String, DateTime, Text, JSON, Index
+from sqlalchemy.dialects.postgresql import JSONB, insert as pg_insert
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import scoped_session, sessionmaker
 import json
 
+# Validation patterns, compiled once at import
+_EMAIL_RE = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+
 Base = declarative_base()
 
+def _utcnow() -> datetime.datetime:
+    """Current time as an aware UTC datetime."""
+    return datetime.datetime.now(datetime.timezone.utc)
+
+# Binary JSON on PostgreSQL so list columns can be GIN-indexed; plain JSON elsewhere
+JSONList = JSONB().with_variant(JSON(), 'sqlite')
+
 class Candidate(Base):
     """Database model for storing candidate information"""
     __tablename__ = 'candidates'
     
     id = Column(Integer, primary_key=True)
-    candidate_id = Column(String(50), unique=True, nullable=False)
+    candidate_id = Column(String(50), unique=True, nullable=False, index=True)
     name = Column(String(100), nullable=False)
-    email = Column(String(100), nullable=False)
+    email = Column(String(100), nullable=False, index=True)
     phone = Column(String(20))
     experience = Column(String(50))
     position = Column(String(200))
     location = Column(String(200))
-    tech_stack = Column(JSON)
-    technical_questions = Column(JSON)
-    created_at = Column(DateTime, default=datetime.datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.datetime.utcnow, onupdate=datetime.datetime.utcnow)
+    tech_stack = Column(JSONList)
+    technical_questions = Column(JSONList)
+    # Timestamps are filled in by the database; upserts set updated_at explicitly.
+    # Legacy tables without a server default get them from _to_row instead
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now())
+    
+    # jsonb_path_ops GIN indexes serve @> containment lookups such as "knows Python"
+    __table_args__ = (
+        Index('ix_candidates_tech_stack_gin', 'tech_stack',
+              postgresql_using='gin', postgresql_ops={'tech_stack': 'jsonb_path_ops'}),
+        Index('ix_candidates_technical_questions_gin', 'technical_questions',
+              postgresql_using='gin', postgresql_ops={'technical_questions': 'jsonb_path_ops'}),
+    )
+
+# Columns overwritten from the incoming row when an upsert hits an existing candidate_id
+_UPSERT_COLUMNS = (
+    'name', 'email', 'phone', 'experience', 'position', 'location',
+    'tech_stack', 'technical_questions'
+)
+
+# Columns returned in candidate list summaries, in row order
+_SUMMARY_COLUMNS = (
+    Candidate.candidate_id, Candidate.name, Candidate.email, Candidate.position,
+    Candidate.experience, Candidate.tech_stack, Candidate.created_at
+)
+
+# Maximum IDs bound into a single IN (...) list
+_IN_CHUNK_SIZE = 1000
 
 class DatabaseHandler:
     """
@@ -36,14 +77,91 @@ class DatabaseHandler:
         if not self.database_url:
             raise ValueError("DATABASE_URL environment variable not found")
         
-        self.engine = create_engine(self.database_url)
+        # Keep a pool of warm connections, checked before use and recycled before
+        # server-side idle timeouts can drop them
+        engine_options = {
+            'pool_size': 10,
+            'max_overflow': 20,
+            'pool_pre_ping': True,
+            'pool_recycle': 1800
+        }
+        
+        # psycopg2 batches executemany INSERTs into multi-VALUES statements and
+        # UPDATE/DELETE through execute_batch, cutting bulk round-trips
+        if make_url(self.database_url).get_driver_name() == 'psycopg2':
+            engine_options['executemany_mode'] = 'values_plus_batch'
+        
+        self.engine = create_engine(self.database_url, **engine_options)
         Base.metadata.create_all(self.engine)
+        self._migrate_schema()
         
-        Session = sessionmaker(bind=self.engine)
-        self.session = Session()
+        # Thread-local sessions, since one handler is shared by every Streamlit session
+        self.Session = scoped_session(sessionmaker(bind=self.engine))
         
         # Privacy settings
         self.data_retention_days = 90  # GDPR compliance
+        
+        # Retention cleanup runs in the background at most this often (seconds)
+        self.cleanup_interval = 3600
+        self._last_cleanup: Optional[float] = None
+        self._cleanup_lock = threading.Lock()
+    
+    def _migrate_schema(self) -> None:
+        """Bring a candidates table created by an earlier version up to the current model."""
+        
+        # create_all leaves existing tables alone, so upgrade column types and defaults here
+        with self.engine.begin() as connection:
+            inspector = inspect(connection)
+            
+            columns = {column['name']: column for column in inspector.get_columns('candidates')}
+            
+            # Each ALTER takes an exclusive lock, so only run the ones the reflected
+            # schema actually needs
+            if self.engine.dialect.name == 'postgresql':
+                for column in ('tech_stack', 'technical_questions'):
+                    if not isinstance(columns[column]['type'], JSONB):
+                        connection.execute(text(
+                            f"ALTER TABLE candidates ALTER COLUMN {column} TYPE jsonb USING {column}::jsonb"
+                        ))
+                for column in ('created_at', 'updated_at'):
+                    # Older columns hold naive UTC values
+                    if not getattr(columns[column]['type'], 'timezone', False):
+                        connection.execute(text(
+                            f"ALTER TABLE candidates ALTER COLUMN {column} TYPE timestamptz "
+                            f"USING {column} AT TIME ZONE 'UTC'"
+                        ))
+                    if columns[column]['default'] is None:
+                        connection.execute(text(f"ALTER TABLE candidates ALTER COLUMN {column} SET DEFAULT now()"))
+                self._client_timestamps = False
+            else:
+                # SQLite can't add a default to an existing column, so legacy tables
+                # keep getting their timestamps from Python
+                self._client_timestamps = columns['created_at']['default'] is None
+            
+            # Column sets that already have a unique constraint or unique index; older
+            # tables enforce candidate_id through a UNIQUE constraint, and a second
+            # unique index on it would only double the write cost
+            unique_columns = [
+                constraint['column_names']
+                for constraint in inspector.get_unique_constraints('candidates')
+            ] + [
+                index['column_names']
+                for index in inspector.get_indexes('candidates') if index['unique']
+            ]
+            
+            # Indexes added since the table was created, including the GIN ones
+            for index in Candidate.__table__.indexes:
+                if index.unique and [column.name for column in index.columns] in unique_columns:
+                    continue
+                index.create(connection, checkfirst=True)
+            
+            # Rows saved without a created_at would never match the retention cutoff;
+            # start their retention period now
+            connection.execute(
+                update(Candidate.__table__)
+                .where(Candidate.created_at.is_(None))
+                .values(created_at=func.coalesce(Candidate.updated_at, func.now()))
+            )
     
     def save_candidate_data(self, candidate_data: Dict[str, Any]) -> bool:
         """
@@ -62,51 +180,94 @@ class DatabaseHandler:
                 print("Warning: Candidate data validation failed")
                 return False
             
-            # Generate unique candidate ID
-            candidate_id = self._generate_candidate_id(candidate_data)
-            
-            # Check if candidate already exists
-            existing = self.session.query(Candidate).filter_by(candidate_id=candidate_id).first()
-            
-            if existing:
-                # Update existing candidate
-                existing.name = candidate_data.get('name')
-                existing.email = candidate_data.get('email')
-                existing.phone = candidate_data.get('phone')
-                existing.experience = candidate_data.get('experience')
-                existing.position = candidate_data.get('position')
-                existing.location = candidate_data.get('location')
-                existing.tech_stack = candidate_data.get('tech_stack', [])
-                existing.technical_questions = candidate_data.get('technical_questions', [])
-                existing.updated_at = datetime.datetime.utcnow()
-            else:
-                # Create new candidate record
-                candidate = Candidate(
-                    candidate_id=candidate_id,
-                    name=candidate_data.get('name'),
-                    email=candidate_data.get('email'),
-                    phone=candidate_data.get('phone'),
-                    experience=candidate_data.get('experience'),
-                    position=candidate_data.get('position'),
-                    location=candidate_data.get('location'),
-                    tech_stack=candidate_data.get('tech_stack', []),
-                    technical_questions=candidate_data.get('technical_questions', [])
-                )
-                self.session.add(candidate)
+            # Map onto table columns, including the generated unique candidate ID
+            row = self._to_row(candidate_data)
+            candidate_id = row['candidate_id']
             
-            self.session.commit()
+            # Insert or update in one round-trip, keyed on the unique candidate_id
+            with self.Session() as session:
+                session.execute(self._upsert_statement().values(**row))
+                session.commit()
             print(f"Candidate data saved successfully: {candidate_id}")
             
-            # Clean old data if needed
-            self._cleanup_old_data()
+            # Clean old data if needed, off the save path and at most once per interval
+            self._schedule_cleanup()
             
             return True
             
         except Exception as e:
-            self.session.rollback()
             print(f"Error saving candidate data: {str(e)}")
             return False
     
+    def save_candidates_bulk(self, candidates: List[Dict[str, Any]]) -> int:
+        """
+        Save many candidates with a single batched upsert.
+        
+        Args:
+            candidates: List of candidate information dictionaries
+            
+        Returns:
+            Number of candidates saved (invalid entries are skipped)
+        """
+        
+        try:
+            # Key rows by candidate ID so the last entry wins; Postgres rejects an upsert
+            # that touches the same row twice in one statement
+            rows = {}
+            for candidate_data in candidates:
+                if self._validate_candidate_data(candidate_data):
+                    row = self._to_row(candidate_data)
+                    rows[row['candidate_id']] = row
+            
+            if not rows:
+                return 0
+            
+            with self.Session() as session:
+                session.execute(self._upsert_statement(), list(rows.values()))
+                session.commit()
+            print(f"Saved {len(rows)} candidate records")
+            
+            # Clean old data if needed, off the save path and at most once per interval
+            self._schedule_cleanup()
+            
+            return len(rows)
+            
+        except Exception as e:
+            print(f"Error saving candidate data in bulk: {str(e)}")
+            return 0
+    
+    @staticmethod
+    def _upsert_statement():
+        """Build an INSERT that updates the existing row when the candidate_id already exists."""
+        
+        stmt = pg_insert(Candidate)
+        return stmt.on_conflict_do_update(
+            index_elements=['candidate_id'],
+            set_={
+                **{column: stmt.excluded[column] for column in _UPSERT_COLUMNS},
+                'updated_at': func.now()
+            }
+        )
+    
+    def _to_row(self, candidate_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Map candidate information onto the columns of the candidates table."""
+        
+        row = {
+            'candidate_id': self._generate_candidate_id(candidate_data),
+            'name': candidate_data.get('name'),
+            'email': candidate_data.get('email'),
+            'phone': candidate_data.get('phone'),
+            'experience': candidate_data.get('experience'),
+            'position': candidate_data.get('position'),
+            'location': candidate_data.get('location'),
+            'tech_stack': candidate_data.get('tech_stack', []),
+            'technical_questions': candidate_data.get('technical_questions', [])
+        }
+        # Legacy tables have no server-side default for the timestamps
+        if self._client_timestamps:
+            row['created_at'] = row['updated_at'] = _utcnow()
+        return row
+    
     def _validate_candidate_data(self, data: Dict[str, Any]) -> bool:
         """Validate candidate data structure and content."""
         
@@ -119,9 +280,7 @@ class DatabaseHandler:
                 return False
         
         # Validate email format
-        import re
-        email_pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-        if not re.match(email_pattern, data['email']):
+        if not _EMAIL_RE.match(data['email']):
             print("Invalid email format")
             return False
         
@@ -134,29 +293,43 @@ class DatabaseHandler:
         email = candidate_data.get('email', '')
         name = candidate_data.get('name', '')
         
-        # Simple hash-based ID
+        # Stable hash-based ID; the built-in hash() is salted per process, so restarts
+        # would mint a new ID and the upsert would never match the existing row
         combined = f"{email}{name}".lower().replace(' ', '')
-        candidate_id = str(abs(hash(combined)))[:8]
+        candidate_id = hashlib.blake2b(combined.encode('utf-8'), digest_size=6).hexdigest()
         
         return candidate_id
     
+    def _schedule_cleanup(self) -> None:
+        """Start a background retention cleanup if none has run within the cleanup interval."""
+        
+        # Saves from concurrent Streamlit sessions race here; only one may claim the slot
+        now = time.monotonic()
+        with self._cleanup_lock:
+            if self._last_cleanup is not None and now - self._last_cleanup < self.cleanup_interval:
+                return
+            self._last_cleanup = now
+        
+        threading.Thread(target=self._cleanup_old_data, daemon=True).start()
+    
     def _cleanup_old_data(self) -> None:
         """Remove data records older than retention period."""
         
         try:
-            retention_limit = datetime.datetime.utcnow() - datetime.timedelta(days=self.data_retention_days)
-            
-            # Delete old records
-            deleted_count = self.session.query(Candidate).filter(
-                Candidate.created_at < retention_limit
-            ).delete()
+            retention_limit = _utcnow() - datetime.timedelta(days=self.data_retention_days)
             
-            if deleted_count > 0:
-                self.session.commit()
-                print(f"Removed {deleted_count} expired candidate records")
+            # Delete old records server-side, without syncing or loading matching rows
+            with self.Session() as session:
+                deleted_count = session.execute(
+                    delete(Candidate).where(Candidate.created_at < retention_limit),
+                    execution_options={'synchronize_session': False}
+                ).rowcount
+                
+                if deleted_count > 0:
+                    session.commit()
+                    print(f"Removed {deleted_count} expired candidate records")
                 
         except Exception as e:
-            self.session.rollback()
             print(f"Error during data cleanup: {str(e)}")
     
     def get_candidate_summary(self, candidate_id: str) -> Optional[Dict[str, Any]]:
@@ -171,19 +344,11 @@ class DatabaseHandler:
         """
         
         try:
-            candidate = self.session.query(Candidate).filter_by(candidate_id=candidate_id).first()
-            
-            if candidate:
-                return {
-                    'candidate_id': candidate.candidate_id,
-                    'name': candidate.name,
-                    'email': candidate.email,
-                    'position': candidate.position,
-                    'experience': candidate.experience,
-                    'tech_stack': candidate.tech_stack or [],
-                    'technical_questions': candidate.technical_questions or [],
-                    'created_at': candidate.created_at.isoformat() if candidate.created_at else None
-                }
+            with self.Session() as session:
+                candidate = session.query(Candidate).filter_by(candidate_id=candidate_id).first()
+                
+                if candidate:
+                    return self._candidate_summary(candidate)
             
             return None
             
@@ -191,6 +356,51 @@ class DatabaseHandler:
             print(f"Error retrieving candidate summary: {str(e)}")
             return None
     
+    def get_candidate_summaries(self, candidate_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Retrieve summaries for several candidates in as few queries as possible.
+        
+        Args:
+            candidate_ids: The candidate identifiers
+            
+        Returns:
+            Mapping of candidate ID to summary; IDs that are not found are left out
+        """
+        
+        try:
+            ids = list(dict.fromkeys(candidate_ids))
+            summaries = {}
+            
+            with self.Session() as session:
+                # One IN-list query per chunk keeps the bind parameter count bounded
+                for start in range(0, len(ids), _IN_CHUNK_SIZE):
+                    stmt = select(Candidate).where(
+                        Candidate.candidate_id.in_(ids[start:start + _IN_CHUNK_SIZE])
+                    )
+                    for candidate in session.execute(stmt).scalars():
+                        summaries[candidate.candidate_id] = self._candidate_summary(candidate)
+            
+            return summaries
+            
+        except Exception as e:
+            print(f"Error retrieving candidate summaries: {str(e)}")
+            return {}
+    
+    @staticmethod
+    def _candidate_summary(candidate: Candidate) -> Dict[str, Any]:
+        """Build the detailed summary dict for one candidate row."""
+        
+        return {
+            'candidate_id': candidate.candidate_id,
+            'name': candidate.name,
+            'email': candidate.email,
+            'position': candidate.position,
+            'experience': candidate.experience,
+            'tech_stack': candidate.tech_stack or [],
+            'technical_questions': candidate.technical_questions or [],
+            'created_at': candidate.created_at.isoformat() if candidate.created_at else None
+        }
+    
     def get_all_candidates(self) -> List[Dict[str, Any]]:
         """
         Retrieve all candidates summary.
@@ -200,22 +410,57 @@ class DatabaseHandler:
         """
         
         try:
-            candidates = self.session.query(Candidate).all()
-            
-            return [{
-                'candidate_id': c.candidate_id,
-                'name': c.name,
-                'email': c.email,
-                'position': c.position,
-                'experience': c.experience,
-                'tech_stack': c.tech_stack or [],
-                'created_at': c.created_at.isoformat() if c.created_at else None
-            } for c in candidates]
+            return self._list_summaries(select(*_SUMMARY_COLUMNS))
             
         except Exception as e:
             print(f"Error retrieving candidates: {str(e)}")
             return []
     
+    def get_candidates_by_technology(self, technology: str) -> List[Dict[str, Any]]:
+        """
+        Retrieve summaries of candidates whose tech stack lists a technology.
+        
+        Args:
+            technology: Technology name, matched exactly as the candidate entered it
+            
+        Returns:
+            List of candidate summaries
+        """
+        
+        try:
+            # Compiles to tech_stack @> '["<technology>"]', served by the GIN index
+            if self.engine.dialect.name == 'postgresql':
+                return self._list_summaries(
+                    select(*_SUMMARY_COLUMNS).where(Candidate.tech_stack.contains([technology]))
+                )
+            
+            # Other databases (local SQLite runs) have no JSON containment operator
+            return [
+                summary for summary in self._list_summaries(select(*_SUMMARY_COLUMNS))
+                if technology in summary['tech_stack']
+            ]
+            
+        except Exception as e:
+            print(f"Error retrieving candidates by technology: {str(e)}")
+            return []
+    
+    def _list_summaries(self, stmt) -> List[Dict[str, Any]]:
+        """Run a select of _SUMMARY_COLUMNS and build summary dicts from the plain rows."""
+        
+        with self.Session() as session:
+            # Stream rows in batches instead of materializing ORM objects up front
+            rows = session.execute(stmt.execution_options(yield_per=1000))
+            
+            return [{
+                'candidate_id': candidate_id,
+                'name': name,
+                'email': email,
+                'position': position,
+                'experience': experience,
+                'tech_stack': tech_stack or [],
+                'created_at': created_at.isoformat() if created_at else None
+            } for candidate_id, name, email, position, experience, tech_stack, created_at in rows]
+    
     def delete_candidate_data(self, candidate_id: str) -> bool:
         """
         Delete candidate data for GDPR right to erasure compliance.
@@ -228,22 +473,25 @@ class DatabaseHandler:
         """
         
         try:
-            deleted_count = self.session.query(Candidate).filter_by(candidate_id=candidate_id).delete()
-            
-            if deleted_count > 0:
-                self.session.commit()
-                print(f"Deleted candidate data: {candidate_id}")
-                return True
-            else:
-                print(f"No candidate found with ID: {candidate_id}")
-                return False
+            with self.Session() as session:
+                deleted_count = session.execute(
+                    delete(Candidate).where(Candidate.candidate_id == candidate_id),
+                    execution_options={'synchronize_session': False}
+                ).rowcount
+                
+                if deleted_count > 0:
+                    session.commit()
+                    print(f"Deleted candidate data: {candidate_id}")
+                    return True
+                else:
+                    print(f"No candidate found with ID: {candidate_id}")
+                    return False
             
         except Exception as e:
-            self.session.rollback()
             print(f"Error deleting candidate data: {str(e)}")
             return False
     
     def close(self):
-        """Close database session"""
-        if self.session:
-            self.session.close()
\ No newline at end of file
+        """Discard this thread's database session and release pooled connections"""
+        self.Session.remove()
+        self.engine.dispose()
\ No newline at end of file
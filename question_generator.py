@@ -1,9 +1,47 @@
 import os
+import atexit
+import time
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import json
-import time
+import re
+import tempfile
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
 from typing import Optional, Dict, Any
 
+# Difficulty labels for question numbers 1-3
+DIFFICULTY_LEVELS = ("basic", "intermediate", "advanced")
+
+# A question must contain one of these (as substrings, so "implementation" and
+# "differences" count) and none of the bad patterns; each set is one regex scan
+_TECHNICAL_INDICATORS_RE = re.compile('|'.join(map(re.escape, (
+    'what', 'how', 'why', 'explain', 'describe', 'implement',
+    'difference', 'compare', 'advantage', 'disadvantage',
+    'when', 'where', 'which', 'define', 'demonstrate'
+))))
+_BAD_PATTERNS_RE = re.compile('|'.join(map(re.escape, (
+    'i don\'t know',
+    'sorry',
+    'cannot',
+    'unable',
+    'error',
+    'failed'
+))))
+
+# "Question:" label models sometimes prepend; ASCII-only case folding matches str.lower()
+_QUESTION_PREFIX_RE = re.compile(r'question:', re.IGNORECASE | re.ASCII)
+
+@lru_cache(maxsize=256)
+def _build_prompt(technology: str, difficulty: str) -> str:
+    """Format the instruction prompt; it depends only on the technology and difficulty."""
+    
+    return f"""<s>[INST] You are a technical interviewer. Generate one {difficulty} level technical interview question about {technology}. The question should test practical knowledge and be answerable in 2-3 minutes. Only return the question, nothing else. [/INST]
+
+Here's a {difficulty} technical question about {technology}:"""
+
 class QuestionGenerator:
     """
     Generates technical questions using Hugging Face Inference API.
@@ -17,6 +55,23 @@ class QuestionGenerator:
             "Content-Type": "application/json"
         }
         
+        # Reuse pooled keep-alive connections across calls. The adapter retries
+        # connection errors, rate limits and 5xx/503 (model loading) with jittered
+        # exponential backoff, honoring any Retry-After the API sends
+        retry = Retry(
+            total=3,
+            backoff_factor=1.5,
+            backoff_jitter=0.5,
+            status_forcelist=[429, 500, 502, 503, 504],
+            allowed_methods=frozenset({"POST"}),
+            respect_retry_after_header=True,
+            raise_on_status=False
+        )
+        adapter = HTTPAdapter(pool_connections=10, pool_maxsize=10, max_retries=retry)
+        self.session = requests.Session()
+        self.session.mount("https://", adapter)
+        self.session.headers.update(self.headers)
+        
         # Alternative models to try if primary fails
         self.alternative_models = [
             "microsoft/DialoGPT-large",
@@ -24,8 +79,26 @@ class QuestionGenerator:
             "facebook/blenderbot-400M-distill"
         ]
         
-        # Cache for generated questions to avoid regenerating
-        self.question_cache = {}
+        # LRU cache for generated questions to avoid regenerating, bounded so a
+        # long-running server doesn't grow it without limit
+        self.question_cache = OrderedDict()
+        self.cache_maxsize = 512
+        
+        # The cache is also kept on disk so restarts don't pay for regenerating it.
+        # It lives in the user cache dir unless QUESTION_CACHE_PATH points elsewhere,
+        # since the install directory may be read-only
+        self.cache_path = os.getenv("QUESTION_CACHE_PATH") or os.path.join(
+            os.getenv("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache"),
+            "talentscout", "question_cache.json"
+        )
+        self._load_cache()
+        
+        # New questions are written out at most every cache_save_interval seconds,
+        # with whatever is still pending flushed when the process exits
+        self.cache_save_interval = 30
+        self._cache_dirty = False
+        self._last_cache_save = time.monotonic()
+        atexit.register(self.flush_cache)
     
     def generate_question(self, technology: str, question_number: int) -> Optional[str]:
         """
@@ -42,6 +115,7 @@ class QuestionGenerator:
         # Check cache first
         cache_key = f"{technology.lower()}_{question_number}"
         if cache_key in self.question_cache:
+            self.question_cache.move_to_end(cache_key)
             return self.question_cache[cache_key]
         
         if not self.api_key:
@@ -56,47 +130,65 @@ class QuestionGenerator:
         
         # Try alternative models if primary fails
         if not question:
-            for model in self.alternative_models:
-                alt_url = f"https://api-inference.huggingface.co/models/{model}"
-                question = self._call_huggingface_api(prompt, alt_url)
-                if question:
-                    break
+            question = self._call_alternative_models(prompt)
         
         # Clean and validate the generated question
         if question:
             cleaned_question = self._clean_question(question)
             if cleaned_question:
-                # Cache the question
+                # Cache the question, evicting the least recently used entry when full
                 self.question_cache[cache_key] = cleaned_question
+                if len(self.question_cache) > self.cache_maxsize:
+                    self.question_cache.popitem(last=False)
+                self._cache_dirty = True
+                if time.monotonic() - self._last_cache_save >= self.cache_save_interval:
+                    self.flush_cache()
                 return cleaned_question
         
         return None
     
-    def _create_question_prompt(self, technology: str, question_number: int) -> str:
-        """Create an effective prompt for question generation."""
+    def _call_alternative_models(self, prompt: str) -> Optional[str]:
+        """
+        Query all alternative models concurrently and return the first successful answer.
         
-        difficulty_levels = {
-            1: "basic",
-            2: "intermediate", 
-            3: "advanced"
-        }
+        Args:
+            prompt: The input prompt for question generation
+            
+        Returns:
+            Generated text from the fastest model that answered, or None if all fail
+        """
         
-        difficulty = difficulty_levels.get(question_number, "intermediate")
+        alt_urls = [f"https://api-inference.huggingface.co/models/{model}" for model in self.alternative_models]
+        if not alt_urls:
+            return None
         
-        prompt = f"""<s>[INST] You are a technical interviewer. Generate one {difficulty} level technical interview question about {technology}. The question should test practical knowledge and be answerable in 2-3 minutes. Only return the question, nothing else. [/INST]
-
-Here's a {difficulty} technical question about {technology}:"""
+        executor = ThreadPoolExecutor(max_workers=len(alt_urls))
+        try:
+            futures = [executor.submit(self._call_huggingface_api, prompt, url) for url in alt_urls]
+            for future in as_completed(futures):
+                question = future.result()
+                if question:
+                    return question
+            return None
+        finally:
+            # Don't wait on slower models once one has answered
+            executor.shutdown(wait=False, cancel_futures=True)
+    
+    def _create_question_prompt(self, technology: str, question_number: int) -> str:
+        """Create an effective prompt for question generation."""
         
-        return prompt
+        # Question numbers outside 1-3 fall back to intermediate
+        difficulty = DIFFICULTY_LEVELS[question_number - 1 if 1 <= question_number <= 3 else 1]
+        
+        return _build_prompt(technology, difficulty)
     
-    def _call_huggingface_api(self, prompt: str, api_url: str, max_retries: int = 3) -> Optional[str]:
+    def _call_huggingface_api(self, prompt: str, api_url: str) -> Optional[str]:
         """
-        Call Hugging Face Inference API with retry logic.
+        Call Hugging Face Inference API; retries are handled by the session's Retry policy.
         
         Args:
             prompt: The input prompt for question generation
             api_url: The API endpoint URL
-            max_retries: Maximum number of retry attempts
             
         Returns:
             Generated text or None if all attempts fail
@@ -114,49 +206,36 @@ Here's a {difficulty} technical question about {technology}:"""
             }
         }
         
-        for attempt in range(max_retries):
-            try:
-                response = requests.post(
-                    api_url,
-                    headers=self.headers,
-                    json=payload,
-                    timeout=30
-                )
+        # Retries, backoff and Retry-After handling all happen in the session adapter
+        try:
+            response = self.session.post(
+                api_url,
+                json=payload,
+                timeout=30
+            )
+            
+            if response.status_code == 200:
+                result = response.json()
                 
-                if response.status_code == 200:
-                    result = response.json()
-                    
-                    # Handle different response formats
-                    if isinstance(result, list) and len(result) > 0:
-                        if 'generated_text' in result[0]:
-                            return result[0]['generated_text'].strip()
-                        elif 'text' in result[0]:
-                            return result[0]['text'].strip()
-                    elif isinstance(result, dict):
-                        if 'generated_text' in result:
-                            return result['generated_text'].strip()
-                        elif 'text' in result:
-                            return result['text'].strip()
+                # Handle different response formats
+                if isinstance(result, list) and len(result) > 0:
+                    if 'generated_text' in result[0]:
+                        return result[0]['generated_text'].strip()
+                    elif 'text' in result[0]:
+                        return result[0]['text'].strip()
+                elif isinstance(result, dict):
+                    if 'generated_text' in result:
+                        return result['generated_text'].strip()
+                    elif 'text' in result:
+                        return result['text'].strip()
+            
+            else:
+                print(f"API call failed with status {response.status_code}: {response.text}")
                 
-                elif response.status_code == 503:
-                    # Model is loading, wait and retry
-                    print(f"Model loading, waiting {2 ** attempt} seconds...")
-                    time.sleep(2 ** attempt)
-                    continue
-                    
-                else:
-                    print(f"API call failed with status {response.status_code}: {response.text}")
-                    
-            except requests.exceptions.RequestException as e:
-                print(f"Request failed (attempt {attempt + 1}): {str(e)}")
-                if attempt < max_retries - 1:
-                    time.sleep(1)
-                continue
-            except Exception as e:
-                print(f"Unexpected error (attempt {attempt + 1}): {str(e)}")
-                if attempt < max_retries - 1:
-                    time.sleep(1)
-                continue
+        except requests.exceptions.RequestException as e:
+            print(f"Request failed: {str(e)}")
+        except Exception as e:
+            print(f"Unexpected error: {str(e)}")
         
         return None
     
@@ -177,9 +256,10 @@ Here's a {difficulty} technical question about {technology}:"""
         # Remove common artifacts and clean up
         question = raw_question.strip()
         
-        # Remove "Question:" prefix if present
-        if question.lower().startswith("question:"):
-            question = question[9:].strip()
+        # Remove "Question:" prefix if present, without lowercasing the whole text
+        prefix = _QUESTION_PREFIX_RE.match(question)
+        if prefix:
+            question = question[prefix.end():].lstrip()
         
         # Remove quotes if the entire question is quoted
         if question.startswith('"') and question.endswith('"'):
@@ -187,10 +267,11 @@ Here's a {difficulty} technical question about {technology}:"""
         if question.startswith("'") and question.endswith("'"):
             question = question[1:-1].strip()
         
-        # Split by newlines and take the first substantial line
-        lines = [line.strip() for line in question.split('\n') if line.strip()]
-        if lines:
-            question = lines[0]
+        # Take the first substantial line, stopping at the first one found
+        question = next(
+            (line.strip() for line in question.split('\n') if line and not line.isspace()),
+            question
+        )
         
         # Ensure question ends with a question mark
         if question and not question.endswith('?'):
@@ -225,35 +306,74 @@ Here's a {difficulty} technical question about {technology}:"""
             return False
         
         # Should contain some technical keywords
-        technical_indicators = [
-            'what', 'how', 'why', 'explain', 'describe', 'implement',
-            'difference', 'compare', 'advantage', 'disadvantage',
-            'when', 'where', 'which', 'define', 'demonstrate'
-        ]
-        
         question_lower = question.lower()
-        if not any(indicator in question_lower for indicator in technical_indicators):
+        if not _TECHNICAL_INDICATORS_RE.search(question_lower):
             return False
         
         # Avoid obviously bad questions
-        bad_patterns = [
-            'i don\'t know',
-            'sorry',
-            'cannot',
-            'unable',
-            'error',
-            'failed'
-        ]
-        
-        if any(pattern in question_lower for pattern in bad_patterns):
+        if _BAD_PATTERNS_RE.search(question_lower):
             return False
         
         return True
     
+    def _load_cache(self) -> None:
+        """Load previously generated questions from the on-disk cache, if any."""
+        
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                cached = json.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            print(f"Ignoring unreadable question cache: {str(e)}")
+            return
+        
+        if not isinstance(cached, dict):
+            print("Ignoring malformed question cache: expected a JSON object")
+            return
+        
+        # Entries are stored oldest first, so keep the most recently used ones
+        entries = [
+            (key, question) for key, question in cached.items()
+            if isinstance(question, str)
+        ]
+        for key, question in entries[-self.cache_maxsize:]:
+            self.question_cache[key] = question
+    
+    def flush_cache(self) -> None:
+        """Write any questions generated since the last save to disk."""
+        
+        if self._cache_dirty:
+            self._save_cache()
+    
+    def _save_cache(self) -> None:
+        """Write the question cache to disk, replacing the previous file atomically."""
+        
+        self._cache_dirty = False
+        self._last_cache_save = time.monotonic()
+        cache_dir = os.path.dirname(self.cache_path) or "."
+        tmp_path = None
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            # A uniquely named temp file, so concurrent writers never share one
+            with tempfile.NamedTemporaryFile(
+                'w', encoding='utf-8', dir=cache_dir,
+                prefix=f".{os.path.basename(self.cache_path)}.", suffix='.tmp', delete=False
+            ) as f:
+                tmp_path = f.name
+                # Snapshot, so questions generated by other threads can't change it mid-dump
+                json.dump(dict(self.question_cache), f, ensure_ascii=False)
+            os.replace(tmp_path, self.cache_path)
+        except OSError as e:
+            print(f"Could not persist question cache: {str(e)}")
+            if tmp_path and os.path.exists(tmp_path):
+                os.remove(tmp_path)
+    
     def get_cached_questions(self) -> Dict[str, str]:
         """Return all cached questions."""
-        return self.question_cache.copy()
+        return dict(self.question_cache)
     
     def clear_cache(self) -> None:
         """Clear the question cache."""
         self.question_cache.clear()
+        self._save_cache()